@@ -1,8 +1,9 @@
 import streamlit as st
-import pandas as pd
 import sqlite3
-import plotly.express as px
-import plotly.graph_objects as go
+
+import ola_data
+
+ola_data.profile_start("app")
 
 # ----------------------------------------------------
 # PAGE CONFIG
@@ -75,34 +76,17 @@ body {
 st.markdown('<div class="main-title">🚖 OLA Ride-Sharing Analytics Dashboard</div>', unsafe_allow_html=True)
 
 # ----------------------------------------------------
-# LOAD DATA
-# ----------------------------------------------------
-@st.cache_data
-def load_data():
-    df = pd.read_excel("dataset.xlsx", engine="openpyxl")
-    df.columns = df.columns.str.strip()
-    return df
-
-df = load_data()
-
-# ----------------------------------------------------
-# CREATE SQLITE DATABASE
+# 🔥 KPI CALCULATIONS (from the precomputed summary)
 # ----------------------------------------------------
-@st.cache_resource
-def create_connection(df):
-    conn = sqlite3.connect("ola.db", check_same_thread=False)
-    df.to_sql("bookings", conn, index=False, if_exists="replace")
-    return conn
-
-conn = create_connection(df)
-
-# ----------------------------------------------------
-# 🔥 KPI CALCULATIONS
-# ----------------------------------------------------
-total_rides = len(df)
-successful_rides = len(df[df["Booking_Status"] == "Success"])
-cancelled_rides = len(df[df["Booking_Status"] != "Success"])
-total_revenue = df[df["Booking_Status"] == "Success"]["Booking_Value"].sum()
+# Resolve the snapshot once so the summary, the frame, the database and the
+# query cache key all come from the same version even if a refresh lands
+# mid-run.
+snapshot = ola_data.current_snapshot()
+summary = ola_data.load_summary(snapshot)
+total_rides = summary["total_rides"]
+successful_rides = summary["successful_rides"]
+cancelled_rides = summary["cancelled_rides"]
+total_revenue = summary["total_revenue"]
 
 # ----------------------------------------------------
 # 📊 KPI CARDS
@@ -142,95 +126,177 @@ with col4:
     """, unsafe_allow_html=True)
 
 st.markdown("<br>", unsafe_allow_html=True)
+ola_data.profile_mark("first paint")
 
 # ----------------------------------------------------
-# SIDEBAR QUERY SELECT
+# QUERY PARAMETERS
 # ----------------------------------------------------
-st.sidebar.header("📌 Select SQL Query")
+# Choice parameters draw their options from the precomputed summary, so the
+# sidebar is ready before the full dataset is loaded.
+def choice_param(label, options, default):
+    return {"type": "choice", "label": label, "default": default,
+            "options": [o for o in options if isinstance(o, str)]}
 
-query_option = st.sidebar.selectbox(
-    "Choose Query",
-    [
-        "Retrieve all successful bookings",
-        "Find the average ride distance for each vehicle type",
-        "Total Cancelled Rides by Customers",
-        "Top 5 Customers",
-        "Driver Cancellations due to Personal and Car Issues",
-        "Maximum and Minimum Driver Ratings for Prime Sedan Bookings",
-        "Rides Paid Using UPI",
-        "Average Customer Rating per Vehicle Type",
-        "Total Booking Value of Successfully Completed Rides",
-        "Incomplete Rides with Cancellation Reason"
-    ]
-)
+def int_param(label, min_value, max_value, default):
+    return {"type": "int", "label": label, "default": default,
+            "min": min_value, "max": max_value}
 
 # ----------------------------------------------------
 # SQL QUERIES
 # ----------------------------------------------------
+# Values are bound as :named parameters rather than pasted into the SQL, so
+# each query has a single statement text that sqlite3 compiles once and
+# reuses from its per-connection statement cache for every parameter value.
 queries = {
-    "Retrieve all successful bookings": """
+    "Retrieve bookings by status": {
+        "sql": """
         SELECT * FROM bookings
-        WHERE Booking_Status = 'Success'
+        WHERE Booking_Status = :status
     """,
-    "Find the average ride distance for each vehicle type": """
+        "params": {
+            "status": choice_param("Booking Status", summary["booking_statuses"], "Success"),
+        },
+    },
+    "Find the average ride distance for each vehicle type": {
+        "sql": """
         SELECT Vehicle_Type,
                AVG(Ride_Distance) AS Avg_Distance
         FROM bookings
         GROUP BY Vehicle_Type
     """,
-    "Total Cancelled Rides by Customers": """
-        SELECT COUNT(*) AS Total_Cancelled_By_Customer
+        "params": {},
+    },
+    "Total Rides by Booking Status": {
+        "sql": """
+        SELECT COUNT(*) AS Total_Rides
         FROM bookings
-        WHERE Booking_Status = 'Canceled by Customer'
+        WHERE Booking_Status = :status
     """,
-    "Top 5 Customers": """
+        "params": {
+            "status": choice_param("Booking Status", summary["booking_statuses"], "Canceled by Customer"),
+        },
+    },
+    "Top Customers": {
+        "sql": """
         SELECT Customer_ID,
                COUNT(*) AS Total_Rides
         FROM bookings
         GROUP BY Customer_ID
         ORDER BY Total_Rides DESC
-        LIMIT 5
+        LIMIT :limit
     """,
-    "Driver Cancellations due to Personal and Car Issues": """
+        "params": {
+            "limit": int_param("Number of Customers", 1, 50, 5),
+        },
+    },
+    "Driver Cancellations due to Personal and Car Issues": {
+        "sql": """
         SELECT COUNT(*) AS Canceled_Rides_by_Driver
         FROM bookings
         WHERE Booking_Status = 'Canceled by Driver'
         AND (Canceled_Rides_by_Driver LIKE '%Personal%'
              OR Canceled_Rides_by_Driver LIKE '%Car%')
     """,
-    "Maximum and Minimum Driver Ratings for Prime Sedan Bookings": """
+        "params": {},
+    },
+    "Maximum and Minimum Driver Ratings by Vehicle Type": {
+        "sql": """
         SELECT MAX(Driver_Ratings) AS Max_Rating,
                MIN(Driver_Ratings) AS Min_Rating
         FROM bookings
-        WHERE Vehicle_Type = 'Prime Sedan'
+        WHERE Vehicle_Type = :vehicle_type
     """,
-    "Rides Paid Using UPI": """
+        "params": {
+            "vehicle_type": choice_param("Vehicle Type", summary["vehicle_types"], "Prime Sedan"),
+        },
+    },
+    "Rides by Payment Method": {
+        "sql": """
         SELECT * FROM bookings
-        WHERE Payment_Method = 'UPI'
+        WHERE Payment_Method = :payment_method
     """,
-    "Average Customer Rating per Vehicle Type": """
+        "params": {
+            "payment_method": choice_param("Payment Method", summary["payment_methods"], "UPI"),
+        },
+    },
+    "Average Customer Rating per Vehicle Type": {
+        "sql": """
         SELECT Vehicle_Type,
                AVG(Customer_Rating) AS Avg_Customer_Rating
         FROM bookings
         GROUP BY Vehicle_Type
     """,
-    "Total Booking Value of Successfully Completed Rides": """
+        "params": {},
+    },
+    "Total Booking Value of Successfully Completed Rides": {
+        "sql": """
         SELECT SUM(Booking_Value) AS Total_Revenue
         FROM bookings
         WHERE Booking_Status = 'Success'
     """,
-    "Incomplete Rides with Cancellation Reason": """
+        "params": {},
+    },
+    "Incomplete Rides with Cancellation Reason": {
+        "sql": """
     SELECT 
         Booking_ID,
         Booking_Status,
         COALESCE(Canceled_Rides_by_Customer, Canceled_Rides_by_Driver) AS Cancellation_Reason
     FROM bookings
     WHERE Booking_Status != 'Success'
-"""
+""",
+        "params": {},
+    },
 }
 
-selected_query = queries[query_option]
-result = pd.read_sql_query(selected_query, conn)
+# ----------------------------------------------------
+# SIDEBAR QUERY SELECT
+# ----------------------------------------------------
+st.sidebar.header("📌 Select SQL Query")
+
+query_option = st.sidebar.selectbox("Choose Query", list(queries))
+
+def param_widget(name, spec):
+    key = f"{query_option}:{name}"
+    if spec["type"] == "int":
+        return int(st.sidebar.number_input(spec["label"], min_value=spec["min"],
+                                           max_value=spec["max"], value=spec["default"],
+                                           step=1, key=key))
+    options = spec["options"]
+    index = options.index(spec["default"]) if spec["default"] in options else 0
+    return st.sidebar.selectbox(spec["label"], options, index=index, key=key)
+
+selected_query = queries[query_option]["sql"]
+query_params = {name: param_widget(name, spec)
+                for name, spec in queries[query_option]["params"].items()}
+
+# ----------------------------------------------------
+# OPEN SQLITE DATABASE
+# ----------------------------------------------------
+# The database is built once per snapshot by ola_data.ingest(); every
+# worker opens it read-only. One entry only, so after a refresh the old
+# snapshot's connection is released instead of keeping its file open.
+@st.cache_resource(max_entries=1)
+def create_connection(snapshot):
+    path = ola_data.snapshot_path(snapshot, "db")
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+
+conn = create_connection(snapshot)
+
+# ----------------------------------------------------
+# RUN QUERY (cached per query + parameter values)
+# ----------------------------------------------------
+# Bounded so that full SELECT * results for every value someone has picked
+# do not pile up in each worker's memory.
+@st.cache_data(max_entries=32)
+def run_query(sql, params, version, _conn):
+    import pandas as pd
+
+    return pd.read_sql_query(sql, _conn, params=dict(params))
+
+with st.spinner("Loading ride data..."):
+    result = run_query(selected_query, tuple(sorted(query_params.items())),
+                       snapshot, conn)
 
 # ----------------------------------------------------
 # DATA + VISUAL SECTION
@@ -243,9 +309,15 @@ with col_table:
     st.dataframe(result, use_container_width=True)
 
 with col_chart:
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     template_style = "plotly_dark"
 
-    if query_option == "Retrieve all successful bookings":
+    # Only these two charts need the full frame, so it is mapped here rather
+    # than up front; the other queries never touch pyarrow.
+    if query_option == "Retrieve bookings by status":
+        df = ola_data.load_bookings(snapshot)
         fig = px.pie(df, names="Booking_Status", hole=0.6)
         fig.update_layout(template=template_style)
         st.plotly_chart(fig, use_container_width=True)
@@ -256,14 +328,14 @@ with col_chart:
         fig.update_layout(template=template_style)
         st.plotly_chart(fig, use_container_width=True)
 
-    elif query_option == "Total Cancelled Rides by Customers":
+    elif query_option == "Total Rides by Booking Status":
         fig = go.Figure(go.Indicator(mode="number",
                                      value=result.iloc[0, 0],
-                                     title={"text": "Cancelled by Customers"}))
+                                     title={"text": query_params["status"]}))
         fig.update_layout(template=template_style)
         st.plotly_chart(fig, use_container_width=True)
 
-    elif query_option == "Top 5 Customers":
+    elif query_option == "Top Customers":
         fig = px.bar(result, x="Total_Rides", y="Customer_ID",
                      orientation="h", color="Total_Rides")
         fig.update_layout(template=template_style)
@@ -276,14 +348,15 @@ with col_chart:
         fig.update_layout(template=template_style)
         st.plotly_chart(fig, use_container_width=True)
 
-    elif query_option == "Maximum and Minimum Driver Ratings for Prime Sedan Bookings":
+    elif query_option == "Maximum and Minimum Driver Ratings by Vehicle Type":
         fig = go.Figure()
-        fig.add_trace(go.Bar(name="Max", x=["Prime Sedan"], y=[result["Max_Rating"][0]]))
-        fig.add_trace(go.Bar(name="Min", x=["Prime Sedan"], y=[result["Min_Rating"][0]]))
+        fig.add_trace(go.Bar(name="Max", x=[query_params["vehicle_type"]], y=[result["Max_Rating"][0]]))
+        fig.add_trace(go.Bar(name="Min", x=[query_params["vehicle_type"]], y=[result["Min_Rating"][0]]))
         fig.update_layout(template=template_style, barmode='group')
         st.plotly_chart(fig, use_container_width=True)
 
-    elif query_option == "Rides Paid Using UPI":
+    elif query_option == "Rides by Payment Method":
+        df = ola_data.load_bookings(snapshot)
         payment_counts = df["Payment_Method"].value_counts().reset_index()
         payment_counts.columns = ["Payment_Method", "Count"]
         fig = px.pie(payment_counts, names="Payment_Method", values="Count", hole=0.5)
@@ -315,6 +388,9 @@ with col_chart:
 # ----------------------------------------------------
 st.markdown('<div class="section-title">💻 SQL Query</div>', unsafe_allow_html=True)
 st.code(selected_query, language='sql')
+if query_params:
+    st.caption("Parameters: " + ", ".join(f":{k} = {v!r}" for k, v in query_params.items()))
 
 st.markdown("---")
-st.markdown("📍 Built with SQL + Streamlit | Power BI Style Dashboard")
\ No newline at end of file
+st.markdown("📍 Built with SQL + Streamlit | Power BI Style Dashboard")
+ola_data.profile_mark("done")
\ No newline at end of file
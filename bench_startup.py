@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+# ----------------------------------------------------
+# Cold-start benchmark: every run is a fresh interpreter, so module imports
+# and st.cache_data start empty, just like a newly started server process.
+# "harness" is the time to import streamlit's AppTest before the page runs;
+# first paint and script done are measured from the top of the page script.
+# A missing mark (the page failed before reaching it) is shown as "n/a".
+#
+# By default the on-disk snapshot (snapshots/, including the KPI summary)
+# is left alone, so only the very first run may pay for ingest and every
+# other row measures a cold process with a warm snapshot. --fresh deletes
+# snapshots/ before each run so every row includes the full ingest.
+#
+#   python bench_startup.py [--runs N] [--fresh] > bench_output.txt
+# ----------------------------------------------------
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PAGES = ["app.py", "pages/dashboard.py", "pages/insight.py"]
+
+RUNNER = """
+import json, os, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, ".")
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+t_script = time.perf_counter()
+at.run()
+t_end = time.perf_counter()
+import ola_data
+marks = ola_data.profile_marks(os.path.splitext(os.path.basename(sys.argv[1]))[0])
+print(json.dumps({
+    "harness_import_s": t_script - t0,
+    "first_paint_s": marks.get("first paint"),
+    "done_s": marks.get("done"),
+    "wall_s": t_end - t0,
+    "exception": [e.message for e in at.exception],
+}))
+"""
+
+
+def run_page(page):
+    out = subprocess.run(
+        [sys.executable, "-c", RUNNER, page],
+        cwd=ROOT,
+        env=dict(os.environ, OLA_STARTUP_PROFILE="1"),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def fmt_ms(seconds):
+    return "n/a" if seconds is None else f"{seconds * 1000:.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for each page.")
+    parser.add_argument("--runs", type=int, default=3, help="runs per page")
+    parser.add_argument("--fresh", action="store_true",
+                        help="delete snapshots/ before each run so every row includes ingest")
+    args = parser.parse_args()
+
+    mode = "fresh snapshot per run" if args.fresh else "snapshot reused after first ingest"
+    print(f"# {mode}")
+    print(f"{'page':<22}{'run':>4}{'harness':>12}{'first paint':>14}{'script done':>14}{'wall':>10}")
+    for page in PAGES:
+        for i in range(args.runs):
+            if args.fresh:
+                shutil.rmtree(os.path.join(ROOT, "snapshots"), ignore_errors=True)
+            r = run_page(page)
+            print(f"{page:<22}{i + 1:>4}{r['harness_import_s']:>10.2f} s"
+                  f"{fmt_ms(r['first_paint_s']):>14}{fmt_ms(r['done_s']):>14}"
+                  f"{r['wall_s']:>8.2f} s")
+            if r["exception"]:
+                print(f"  exception: {r['exception']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: ingest is left unserialized
+    fcntl = None
+
+import streamlit as st
+
+# ----------------------------------------------------
+# Shared data access for every page.
+#
+# Only the standard library and streamlit are imported at module level;
+# pandas and pyarrow are pulled in the first time the data is needed, so a
+# page that never touches the data (pages/insight.py) or that can paint
+# its KPI row from the precomputed summary does not pay for it up front.
+# ----------------------------------------------------
+
+DATASET_PATH = "dataset.xlsx"
+
+# Set OLA_STARTUP_PROFILE=1 to log per-page startup timings to stderr.
+PROFILE_ENABLED = os.environ.get("OLA_STARTUP_PROFILE") == "1"
+
+# Script runs execute one per thread, so each run keeps its own start time
+# and marks; concurrent sessions (and marks fired from inside cached
+# functions) are attributed to the run that triggered them.
+_profile_local = threading.local()
+
+# Marks of the most recent run of each page, for readers on other threads
+# such as bench_startup.py.
+_profile_last = {}
+
+
+# ----------------------------------------------------
+# STARTUP PROFILE
+# ----------------------------------------------------
+def profile_start(page):
+    """Reset the startup profile at the top of a page script."""
+    _profile_local.page = page
+    _profile_local.start = time.perf_counter()
+    _profile_local.marks = {"start": 0.0}
+    _profile_last[page] = dict(_profile_local.marks)
+
+
+def profile_mark(label):
+    """Record seconds elapsed since profile_start() under ``label``."""
+    page = getattr(_profile_local, "page", None)
+    if page is None:
+        return
+    elapsed = time.perf_counter() - _profile_local.start
+    _profile_local.marks[label] = elapsed
+    _profile_last[page] = dict(_profile_local.marks)
+    if PROFILE_ENABLED:
+        print(f"[startup] {page}: {label} at {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+def profile_marks(page):
+    """Return the latest run's marks for ``page`` as a {label: seconds} dict."""
+    return dict(_profile_last.get(page, {}))
+
+
+# ----------------------------------------------------
+# ARROW SNAPSHOT (ingest once, memory-map everywhere)
+#
+# The workbook is parsed once into an immutable snapshot under SNAPSHOT_DIR:
+# an Arrow IPC file that every server process memory-maps read-only, a
+# SQLite file holding the same rows for the SQL page, opened read-only, and
+# the small JSON KPI summary. The data files live in the OS page cache and
+# are shared between workers instead of each one holding or rebuilding its
+# own copy.
+#
+# SNAPSHOT_CURRENT names the live snapshot. A refresh writes a new
+# snapshot next to the old one and then swaps the pointer with
+# os.replace(), so readers always see either the old or the new version.
+# ----------------------------------------------------
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_CURRENT = os.path.join(SNAPSHOT_DIR, "CURRENT")
+SNAPSHOT_LOCK = os.path.join(SNAPSHOT_DIR, ".lock")
+
+
+def _snapshot_name(signature):
+    return "bookings-{}-{}".format(*signature)
+
+
+def snapshot_path(name, ext):
+    """Path of the ``ext`` ("arrow", "db" or "json") file of snapshot ``name``."""
+    return os.path.join(SNAPSHOT_DIR, f"{name}.{ext}")
+
+
+def _read_current():
+    try:
+        with open(SNAPSHOT_CURRENT, encoding="utf-8") as fh:
+            return fh.read().strip() or None
+    except OSError:
+        return None
+
+
+def _read_workbook():
+    import pandas as pd
+
+    profile_mark("pandas imported")
+    df = pd.read_excel(DATASET_PATH, engine="openpyxl")
+    df.columns = df.columns.str.strip()
+    df["Date"] = pd.to_datetime(df["Date"])
+    profile_mark("workbook loaded")
+    return df
+
+
+def _write_arrow(df, path):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # from_pandas turns float NaN into Arrow nulls, and columns with nulls
+    # cannot be handed to pandas without a copy. Store NaN as NaN instead
+    # so the nullable numeric columns stay views onto the mapping too.
+    for i, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type) and table.column(i).null_count:
+            values = pa.array(df[field.name].to_numpy(), from_pandas=False)
+            table = table.set_column(i, field, values)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _write_sqlite(df, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with contextlib.closing(sqlite3.connect(tmp_path)) as conn:
+        df.to_sql("bookings", conn, index=False, if_exists="replace")
+    os.replace(tmp_path, path)
+
+
+def _write_summary(df, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(_build_summary(df), fh)
+    os.replace(tmp_path, path)
+
+
+@contextlib.contextmanager
+def _ingest_lock():
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    with open(SNAPSHOT_LOCK, "a") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        yield
+
+
+def ingest():
+    """Make the snapshot for the current workbook the live one, building it if needed.
+
+    Ingest is serialized across threads and processes; whoever waits on the
+    lock finds the work already done and simply returns the snapshot name.
+    """
+    name = _snapshot_name(_dataset_signature())
+    paths = {ext: snapshot_path(name, ext) for ext in ("arrow", "db", "json")}
+    with _ingest_lock():
+        complete = all(os.path.exists(path) for path in paths.values())
+        if complete and _read_current() == name:
+            return name
+
+        if not complete:
+            df = _read_workbook()
+            _write_arrow(df, paths["arrow"])
+            _write_sqlite(df, paths["db"])
+            _write_summary(df, paths["json"])
+
+        tmp_path = f"{SNAPSHOT_CURRENT}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(name)
+        os.replace(tmp_path, SNAPSHOT_CURRENT)
+
+        # Processes still reading an older snapshot keep their pages after
+        # the unlink; the file only disappears once the last one closes it.
+        # Every writer holds the lock, so any .tmp file left now belongs to
+        # an ingest that crashed part-way.
+        for old in os.listdir(SNAPSHOT_DIR):
+            stale = old.endswith((".arrow", ".db", ".json")) and not old.startswith(name + ".")
+            if stale or old.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(SNAPSHOT_DIR, old))
+                except OSError:
+                    pass
+    return name
+
+
+def current_snapshot():
+    """Name of the live snapshot, ingesting first if the workbook has changed."""
+    name = _read_current()
+    if name != _snapshot_name(_dataset_signature()):
+        name = ingest()
+    return name
+
+
+# ----------------------------------------------------
+# FULL DATASET (heavy)
+# ----------------------------------------------------
+# One entry only: after a refresh the previous snapshot's frame is dropped,
+# releasing its mapping instead of pinning the unlinked file forever.
+@st.cache_resource(max_entries=1)
+def _mapped_bookings(name):
+    import pandas as pd
+    import pyarrow as pa
+
+    source = pa.memory_map(snapshot_path(name, "arrow"), "r")
+    table = pa.ipc.open_file(source).read_all()
+    # split_blocks keeps each numeric and timestamp column as a view onto
+    # the mapping, and ArrowDtype keeps string columns as Arrow arrays over
+    # the same buffers rather than Python objects. Only boolean and
+    # null-bearing timestamp columns are copied per process.
+    strings = {
+        pa.string(): pd.ArrowDtype(pa.string()),
+        pa.large_string(): pd.ArrowDtype(pa.large_string()),
+    }
+    df = table.to_pandas(split_blocks=True, types_mapper=strings.get)
+    profile_mark("snapshot mapped")
+    return df
+
+
+def load_bookings(name=None):
+    """The bookings table, backed by the read-only Arrow snapshot ``name``.
+
+    Pass the name from current_snapshot() when other reads in the same run
+    must see the same version; it defaults to the current snapshot. The
+    returned frame is shared by every session in the process; derive new
+    frames from it rather than modifying it in place.
+    """
+    return _mapped_bookings(name or current_snapshot())
+
+
+# ----------------------------------------------------
+# KPI SUMMARY (tiny, precomputed)
+# ----------------------------------------------------
+def _dataset_signature():
+    stat = os.stat(DATASET_PATH)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _build_summary(df):
+    success = df[df["Booking_Status"] == "Success"]
+    return {
+        "total_rides": int(len(df)),
+        "successful_rides": int(len(success)),
+        "cancelled_rides": int(len(df) - len(success)),
+        "total_revenue": float(success["Booking_Value"].sum()),
+        "avg_driver_rating": float(df["Driver_Ratings"].mean()),
+        "date_min": df["Date"].min().date().isoformat(),
+        "date_max": df["Date"].max().date().isoformat(),
+        "vehicle_types": df["Vehicle_Type"].unique().tolist(),
+        "booking_statuses": df["Booking_Status"].unique().tolist(),
+        "payment_methods": df["Payment_Method"].unique().tolist(),
+    }
+
+
+# Written by ingest() alongside the snapshot, so reading it needs neither
+# pandas nor pyarrow and the KPI row can paint straight away.
+@st.cache_data(max_entries=1)
+def _cached_summary(name):
+    with open(snapshot_path(name, "json"), encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def load_summary(name=None):
+    """Whole-dataset KPIs and filter domains for snapshot ``name`` (default: current)."""
+    summary = _cached_summary(name or current_snapshot())
+    profile_mark("summary loaded")
+    return summary
+
+
+if __name__ == "__main__":
+    # Refresh step: python ola_data.py
+    print(f"current snapshot: {ingest()}")
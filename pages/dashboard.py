@@ -1,19 +1,20 @@
+import datetime
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+import ola_data
+
+ola_data.profile_start("dashboard")
 
 st.set_page_config(layout="wide")
 
 # -----------------------------
-# LOAD DATA
+# FILTER DOMAINS + KPI SUMMARY (tiny, precomputed)
 # -----------------------------
-@st.cache_data
-def load_data():
-    df = pd.read_excel("dataset.xlsx")
-    df["Date"] = pd.to_datetime(df["Date"])
-    return df
-
-df = load_data()
+snapshot = ola_data.current_snapshot()
+summary = ola_data.load_summary(snapshot)
+date_min = datetime.date.fromisoformat(summary["date_min"])
+date_max = datetime.date.fromisoformat(summary["date_max"])
 
 # -----------------------------
 # SIDEBAR FILTERS
@@ -22,55 +23,82 @@ st.sidebar.header("🔎 Filters")
 
 date_range = st.sidebar.date_input(
     "Date Range",
-    [df["Date"].min(), df["Date"].max()]
+    [date_min, date_max]
 )
 
 vehicle_filter = st.sidebar.multiselect(
     "Vehicle Type",
-    df["Vehicle_Type"].unique(),
-    default=df["Vehicle_Type"].unique()
+    summary["vehicle_types"],
+    default=summary["vehicle_types"]
 )
 status_filter = st.sidebar.multiselect(
     "Booking Status",
-    options=df["Booking_Status"].unique(),
-    default=df["Booking_Status"].unique()
+    options=summary["booking_statuses"],
+    default=summary["booking_statuses"]
 )
 payment=st.sidebar.multiselect(
     "Payment Method",   
-    options=df["Payment_Method"].unique(),
-    default=df["Payment_Method"].unique()
+    options=summary["payment_methods"],
+    default=summary["payment_methods"]
+)
+
+st.title("🚖 OLA Ride Analytics Dashboard")
+
+# =============================
+# KPI ROW
+# =============================
+def render_kpis(total_rides, successful_rides, revenue, avg_rating):
+    cancelled_rides = total_rides - successful_rides
+
+    k1, k2, k3, k4, k5 = st.columns(5)
+
+    k1.metric("Total Rides", f"{total_rides:,}")
+    k2.metric("Revenue", f"₹ {revenue:,.0f}")
+    k3.metric("Successful", f"{successful_rides:,}")
+    k4.metric("Cancelled", f"{cancelled_rides:,}")
+    k5.metric("Avg Driver Rating", f"{avg_rating:.2f}")
+
+    st.markdown("---")
+    ola_data.profile_mark("first paint")
+
+# With every filter left at its default the whole-dataset summary already
+# holds the KPIs, so paint them before the workbook is even read. The date
+# filter below includes the whole of its end day, so the default range
+# (summary date_min .. date_max) really does select every row.
+unfiltered = (
+    tuple(date_range) == (date_min, date_max) and
+    len(vehicle_filter) == len(summary["vehicle_types"]) and
+    len(status_filter) == len(summary["booking_statuses"]) and
+    len(payment) == len(summary["payment_methods"])
 )
 
+if unfiltered:
+    render_kpis(summary["total_rides"], summary["successful_rides"],
+                summary["total_revenue"], summary["avg_driver_rating"])
+
+# -----------------------------
+# LOAD DATA (deferred)
+# -----------------------------
+import pandas as pd
+import plotly.express as px
+
+with st.spinner("Loading ride data..."):
+    df = ola_data.load_bookings(snapshot)
 
 filtered_df = df[
     (df["Date"] >= pd.to_datetime(date_range[0])) &
-    (df["Date"] <= pd.to_datetime(date_range[1])) &
+    (df["Date"] < pd.to_datetime(date_range[1]) + pd.Timedelta(days=1)) &
     (df["Vehicle_Type"].isin(vehicle_filter))&
         (df["Booking_Status"].isin(status_filter))&
         (df["Payment_Method"].isin(payment))
 
 ]
 
-st.title("🚖 OLA Ride Analytics Dashboard")
-
-# =============================
-# KPI ROW
-# =============================
-total_rides = len(filtered_df)
-successful_rides = len(filtered_df[filtered_df["Booking_Status"] == "Success"])
-cancelled_rides = total_rides - successful_rides
-revenue = filtered_df[filtered_df["Booking_Status"] == "Success"]["Booking_Value"].sum()
-avg_rating = filtered_df["Driver_Ratings"].mean()
-
-k1, k2, k3, k4, k5 = st.columns(5)
-
-k1.metric("Total Rides", f"{total_rides:,}")
-k2.metric("Revenue", f"₹ {revenue:,.0f}")
-k3.metric("Successful", f"{successful_rides:,}")
-k4.metric("Cancelled", f"{cancelled_rides:,}")
-k5.metric("Avg Driver Rating", f"{avg_rating:.2f}")
-
-st.markdown("---")
+if not unfiltered:
+    successful_df = filtered_df[filtered_df["Booking_Status"] == "Success"]
+    render_kpis(len(filtered_df), len(successful_df),
+                successful_df["Booking_Value"].sum(),
+                filtered_df["Driver_Ratings"].mean())
 
 # =============================
 # ROW 1
@@ -200,4 +228,6 @@ with col10:
                        y="Driver_Ratings",
                        title="🔟 Customer vs Driver Ratings")
     fig10.update_layout(height=300)
-    st.plotly_chart(fig10, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig10, use_container_width=True)
+
+ola_data.profile_mark("done")
\ No newline at end of file
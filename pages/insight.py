@@ -1,11 +1,16 @@
 import streamlit as st
 
+import ola_data
+
+ola_data.profile_start("insight")
+
 st.set_page_config(layout="wide")
 
 st.title("Business Strategy & Operational Insights")
 st.caption("Usha Nitwal")
 
 st.markdown("---")
+ola_data.profile_mark("first paint")
 
 # =====================================================
 # SECTION 1
@@ -198,4 +203,6 @@ Primary strategic priorities:
 
 Focused execution in these areas will enhance operational efficiency,
 improve customer satisfaction, and drive sustainable revenue growth.
-""")
\ No newline at end of file
+""")
+
+ola_data.profile_mark("done")
\ No newline at end of file